@@ -19,12 +19,17 @@ URL_CONTAINMENT_THRESHOLD_WITHOUT_TITLE = 0.35
 MAX_RESULTS_PER_QUERY = 5
 MAX_QUERIES_PER_USER = 2
 MAX_PROXY_ATTEMPTS = 3
+MAX_CONCURRENT_USERS = 5
 
 # Rate limiting (seconds)
 DELAY_BETWEEN_SEARCHES = (1, 3)  # Random range
 DELAY_BETWEEN_QUERIES = (2, 4)   # Random range
 DELAY_BETWEEN_USERS = (3, 6)     # Random range
 
+# Token bucket (per proxy egress IP)
+PROXY_RATE_LIMIT = 0.5  # Tokens refilled per second
+PROXY_RATE_BURST = 2    # Bucket capacity
+
 # Platform settings
 PLATFORMS = {
     'youtube': {
@@ -14,6 +14,27 @@ from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
+# Precompiled normalizers for the hot matching paths
+_NON_WORD_RE = re.compile(r'[^\w]')
+_NON_WORD_SPACE_RE = re.compile(r'[^\w\s]')
+
+
+def _word_match_ratio(words: list, other_words: list) -> float:
+    """Fraction of words with a bidirectional containment partner
+
+    A word counts as matched when it contains - or is contained in - any
+    word from other_words, exactly as the original inline scans did. The
+    lists hold a handful of words each, so the pair scan is negligible
+    next to the page-title fetch.
+    """
+    if not words or not other_words:
+        return 0.0
+    word_matches = sum(
+        1 for word in words
+        if any(word in other or other in word for other in other_words)
+    )
+    return word_matches / len(words)
+
 class EnhancedMatcher:
     """Enhanced matching logic for social media profiles"""
     
@@ -45,8 +66,8 @@ class EnhancedMatcher:
                 return False
                 
             business_lower = business_name.lower().strip()
-            business_clean = re.sub(r'[^\w]', '', business_lower)  # For containment checks
-            business_with_spaces = re.sub(r'[^\w\s]', '', business_lower)  # For word splitting
+            business_clean = _NON_WORD_RE.sub('', business_lower)  # For containment checks
+            business_with_spaces = _NON_WORD_SPACE_RE.sub('', business_lower)  # For word splitting
             
             # Get page title for additional verification
             page_title = self.get_page_title(url, business_name)
@@ -54,7 +75,7 @@ class EnhancedMatcher:
             
             if page_title:
                 # Check if title contains business name - improved word-based matching
-                title_clean = re.sub(r'[^\w\s]', '', page_title.lower())
+                title_clean = _NON_WORD_SPACE_RE.sub('', page_title.lower())
                 business_words = [word for word in business_with_spaces.split() if len(word) > 2]
                 title_words = title_clean.split()
                 
@@ -64,8 +85,7 @@ class EnhancedMatcher:
                     logger.info(f"Exact title match found: '{business_name}' in page title '{page_title}'")
                 # Check for word-based matching (at least 60% of business words in title)
                 elif business_words and title_words:
-                    word_matches = sum(1 for word in business_words if any(word in tword or tword in word for tword in title_words))
-                    match_ratio = word_matches / len(business_words)
+                    match_ratio = _word_match_ratio(business_words, title_words)
                     if match_ratio >= 0.6:
                         title_matches = True
                         logger.info(f"Word-based title match found: '{business_name}' matches page title '{page_title}' (ratio: {match_ratio:.2f})")
@@ -76,7 +96,7 @@ class EnhancedMatcher:
             
             for part in url_path:
                 if part and not part.startswith('?') and len(part) > 2:
-                    clean_part = re.sub(r'[^\w]', '', part.lower())
+                    clean_part = _NON_WORD_RE.sub('', part.lower())
                     if clean_part:
                         potential_usernames.append(clean_part)
             
@@ -102,9 +122,8 @@ class EnhancedMatcher:
                     
                     if business_words and username_words:
                         # Method 1: Check if most significant words from business name appear in username
-                        word_matches = sum(1 for word in business_words if any(word in uword or uword in word for uword in username_words))
-                        match_ratio = word_matches / len(business_words)
-                        
+                        match_ratio = _word_match_ratio(business_words, username_words)
+
                         if match_ratio >= 0.6:  # At least 60% of business words should match
                             username_match = True
                         else:
@@ -216,7 +235,7 @@ class EnhancedMatcher:
         try:
             response = self.session.get(url, timeout=10)
             if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
+                soup = BeautifulSoup(response.content, 'lxml')
                 title_tag = soup.find('title')
                 if title_tag:
                     title = title_tag.get_text().strip()
@@ -236,14 +255,14 @@ class EnhancedMatcher:
                 return 0
             
             business_lower = business_name.lower().strip()
-            business_clean = re.sub(r'[^\w]', '', business_lower)
-            business_with_spaces = re.sub(r'[^\w\s]', '', business_lower)
+            business_clean = _NON_WORD_RE.sub('', business_lower)
+            business_with_spaces = _NON_WORD_SPACE_RE.sub('', business_lower)
             
             title_lower = title.lower().strip()
-            title_clean = re.sub(r'[^\w]', '', title_lower)
+            title_clean = _NON_WORD_RE.sub('', title_lower)
             
             url_lower = url.lower().strip()
-            url_clean = re.sub(r'[^\w]', '', url_lower)
+            url_clean = _NON_WORD_RE.sub('', url_lower)
             
             scores = []
             
@@ -256,8 +275,7 @@ class EnhancedMatcher:
                 title_words = title_lower.split()
                 
                 if business_words and title_words:
-                    word_matches = sum(1 for word in business_words if any(word in tword or tword in word for tword in title_words))
-                    match_ratio = word_matches / len(business_words)
+                    match_ratio = _word_match_ratio(business_words, title_words)
                     scores.append(int(match_ratio * 90))  # Scale to 0-90
             
             # URL matching scores
@@ -268,7 +286,7 @@ class EnhancedMatcher:
                 url_path = url.split('/')
                 for part in url_path:
                     if part and len(part) > 2:
-                        part_clean = re.sub(r'[^\w]', '', part.lower())
+                        part_clean = _NON_WORD_RE.sub('', part.lower())
                         if part_clean and business_clean in part_clean:
                             scores.append(75)
                             break
@@ -8,19 +8,72 @@ import pandas as pd
 import asyncio
 import csv
 import random
+from collections import deque
+from difflib import SequenceMatcher
 import re
 import os
 import logging
-from urllib.parse import quote_plus
+from urllib.parse import quote_plus, parse_qs, urlsplit
 from enhanced_matching import EnhancedMatcher
 from crawl4ai import AsyncWebCrawler
 from bs4 import BeautifulSoup
+import soupsieve
 import requests
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Precompiled SERP selectors - compiled once at import instead of being
+# rebuilt and re-parsed on every select() call
+_SEARCH_RESULT_SELECTORS = tuple(soupsieve.compile(sel) for sel in (
+    'div.g',           # Standard Google result
+    'div[data-ved]',   # Alternative selector
+    '.yuRUbf',         # Another common selector
+    'div.tF2Cxc',      # Yet another selector
+))
+_TITLE_SELECTORS = tuple(soupsieve.compile(sel) for sel in (
+    'h3', '.LC20lb', '[role="heading"]', 'h3 span', '.DKV0Md', '.BNeawe.vvjwJb.AP7Wnd'
+))
+_LINK_SELECTORS = tuple(soupsieve.compile(sel) for sel in ('a[href]', 'a', '[href]'))
+_SNIPPET_SELECTORS = tuple(soupsieve.compile(sel) for sel in ('.VwiC3b', '.s', '.st'))
+
+# Compiled URL validators - one C-level scan replaces the chained
+# substring checks per candidate URL
+_YT_URL_RE = re.compile(r'youtube\.com/(?:channel/|c/|@|user/)')
+_TW_URL_RE = re.compile(r'https?://(?:www\.|m\.)?twitch\.tv/[^/\s]+')
+
+# Platform URL classifiers - one compiled C-level scan per link, with the
+# non-channel YouTube paths folded into a negative lookahead
+_PLATFORM_RES = {
+    'youtube': re.compile(r'youtube\.com/(?!watch\?|shorts/|playlist\?)'),
+    'twitch': re.compile(r'twitch\.tv/'),
+}
+
+
+# X/Twitter profile parsing - one compiled scan plus O(1) stop-word lookup
+# The host must not be a suffix of another domain (netflix.com, max.com)
+_X_USERNAME_RE = re.compile(r'(?<![\w-])(?:x|twitter)\.com/@?([A-Za-z0-9_]{1,15})')
+_X_STOP_WORDS = frozenset({
+    'home', 'explore', 'notifications', 'messages', 'bookmarks', 'lists',
+    'profile', 'more', 'compose', 'search', 'settings', 'help'
+})
+
+
+# Google search URL parts - the constant suffixes are quoted once at import
+_SEARCH_URL_PREFIX = 'https://www.google.com/search?q='
+_SEARCH_SUFFIXES = {
+    'youtube': quote_plus(' youtube channel'),
+    'twitch': quote_plus(' twitch'),
+}
+
+
+def _unwrap_google_redirect(href: str) -> str:
+    """Unwrap Google's /url?q= redirect links in a single parse"""
+    if not href.startswith('/url?q='):
+        return href
+    return parse_qs(urlsplit(href).query).get('q', [href])[0]
+
 class ChannelMatcher(EnhancedMatcher):
     """Enhanced channel matching using sophisticated logic from banana.py"""
     
@@ -36,43 +89,37 @@ class ProxyManager:
     def __init__(self, proxy_file: str):
         self.proxy_file = proxy_file
         self.proxies = []
-        self.current_index = 0
+        self.healthy = deque()
         self.failed_proxies = set()
         self.load_proxies()
     
     def load_proxies(self):
         """Load and shuffle proxy list"""
         try:
-            proxy_df = pd.read_csv(self.proxy_file)
-            for _, row in proxy_df.iterrows():
-                proxy = {
-                    'http': f"http://{row['ip']}:{row['port']}",
-                    'https': f"http://{row['ip']}:{row['port']}"
-                }
-                self.proxies.append(proxy)
-            
+            proxy_df = pd.read_csv(self.proxy_file, usecols=['ip', 'port'],
+                                   dtype={'ip': 'string', 'port': 'string'})
+            # One vectorized concat instead of a per-row dict build; only
+            # the URL string is stored and the proxies dict is assembled
+            # lazily on use
+            self.proxies = ('http://' + proxy_df['ip'] + ':' + proxy_df['port']).to_list()
+
             random.shuffle(self.proxies)
+            self.healthy = deque(self.proxies)
             logger.info(f"Loaded {len(self.proxies)} proxies")
         except Exception as e:
             logger.error(f"Error loading proxies: {e}")
             self.proxies = []
-    
+
     def get_next_proxy(self):
-        """Get next working proxy in rotation"""
-        if not self.proxies:
-            return None
-        
-        attempts = 0
-        while attempts < len(self.proxies):
-            proxy = self.proxies[self.current_index]
-            self.current_index = (self.current_index + 1) % len(self.proxies)
-            
-            proxy_key = f"{proxy['http']}"
-            if proxy_key not in self.failed_proxies:
-                return proxy
-            
-            attempts += 1
-        
+        """Get next working proxy in O(1) rotation"""
+        # Proxies marked failed since they were queued are dropped lazily
+        while self.healthy:
+            proxy_url = self.healthy.popleft()
+            if proxy_url in self.failed_proxies:
+                continue
+            self.healthy.append(proxy_url)
+            return {'http': proxy_url, 'https': proxy_url}
+
         return None
     
     def mark_proxy_failed(self, proxy):
@@ -98,11 +145,8 @@ class SearchEngine:
             proxy = self.proxy_manager.get_next_proxy()
             
             try:
-                # Create search URL
-                if platform == "youtube":
-                    search_url = f"https://www.google.com/search?q={quote_plus(query + ' youtube channel')}"
-                else:  # twitch
-                    search_url = f"https://www.google.com/search?q={quote_plus(query + ' twitch')}"
+                # Create search URL - constant suffix pre-quoted at import
+                search_url = _SEARCH_URL_PREFIX + quote_plus(query) + _SEARCH_SUFFIXES[platform]
                 
                 # Configure crawler
                 crawler_config = {
@@ -126,26 +170,19 @@ class SearchEngine:
                     if result.success:
                         # Parse the HTML directly instead of using complex extraction strategy
                         from bs4 import BeautifulSoup
-                        soup = BeautifulSoup(result.html, 'html.parser')
+                        soup = BeautifulSoup(result.html, 'lxml')
                         
                         # DEBUG: Log what we got
                         logger.debug(f"Page title: {soup.title.string if soup.title else 'No title'}")
                         
                         results = []
-                        
+
                         # Try multiple selectors for Google search results
-                        search_result_selectors = [
-                            'div.g',           # Standard Google result
-                            'div[data-ved]',   # Alternative selector
-                            '.yuRUbf',         # Another common selector
-                            'div.tF2Cxc'      # Yet another selector
-                        ]
-                        
                         search_divs = []
-                        for selector in search_result_selectors:
-                            search_divs = soup.select(selector)
+                        for selector in _SEARCH_RESULT_SELECTORS:
+                            search_divs = selector.select(soup)
                             if search_divs:
-                                logger.debug(f"Found {len(search_divs)} results with selector: {selector}")
+                                logger.debug(f"Found {len(search_divs)} results with selector: {selector.pattern}")
                                 break
                         
                         if not search_divs:
@@ -158,26 +195,11 @@ class SearchEngine:
                                 href = link.get('href', '')
                                 text = link.get_text().strip()
                                 
-                                # Check if it's a platform URL
-                                is_platform_url = False
-                                if platform == 'youtube' and 'youtube.com' in href:
-                                    # Filter out non-channel URLs
-                                    if any(path in href for path in ['/watch?', '/shorts/', '/playlist?']):
-                                        continue
-                                    is_platform_url = True
-                                elif platform == 'twitch' and 'twitch.tv' in href:
-                                    is_platform_url = True
-                                
-                                if is_platform_url and text and len(text) > 3:
+                                # Platform check with non-channel paths excluded
+                                if _PLATFORM_RES[platform].search(href) and text and len(text) > 3:
                                     # Clean Google redirect URLs
-                                    clean_href = href
-                                    if href.startswith('/url?q='):
-                                        try:
-                                            import urllib.parse
-                                            clean_href = urllib.parse.unquote(href.split('/url?q=')[1].split('&')[0])
-                                        except Exception:
-                                            clean_href = href.split('/url?q=')[1].split('&')[0]
-                                    
+                                    clean_href = _unwrap_google_redirect(href)
+
                                     platform_links.append({
                                         'title': text[:100],  # Limit title length
                                         'url': clean_href,
@@ -194,19 +216,16 @@ class SearchEngine:
                             
                             for i, div in enumerate(search_divs[:max_results * 2]):  # Check more results
                                 # Try multiple combinations of selectors
-                                title_selectors = ['h3', '.LC20lb', '[role="heading"]', 'h3 span', '.DKV0Md', '.BNeawe.vvjwJb.AP7Wnd']
-                                link_selectors = ['a[href]', 'a', '[href]']
-                                
                                 title_elem = None
                                 link_elem = None
-                                
-                                for title_sel in title_selectors:
-                                    title_elem = div.select_one(title_sel)
+
+                                for title_sel in _TITLE_SELECTORS:
+                                    title_elem = title_sel.select_one(div)
                                     if title_elem and title_elem.get_text().strip():
                                         break
-                                
-                                for link_sel in link_selectors:
-                                    link_elem = div.select_one(link_sel)
+
+                                for link_sel in _LINK_SELECTORS:
+                                    link_elem = link_sel.select_one(div)
                                     if link_elem and link_elem.get('href'):
                                         break
                                 
@@ -218,22 +237,15 @@ class SearchEngine:
                                     logger.info(f"🔍 DEBUG: Found candidate {i+1}: '{title}' -> '{url}'")
                                     
                                     # Check if it's a platform URL
-                                    is_platform_url = False
-                                    if platform == 'youtube' and 'youtube.com' in url:
-                                        is_platform_url = True
-                                    elif platform == 'twitch' and 'twitch.tv' in url:
-                                        is_platform_url = True
-                                    
-                                    if is_platform_url:
+                                    if _PLATFORM_RES[platform].search(url):
                                         # Clean Google redirect URLs
-                                        if url.startswith('/url?q='):
-                                            try:
-                                                import urllib.parse
-                                                url = urllib.parse.unquote(url.split('/url?q=')[1].split('&')[0])
-                                            except Exception:
-                                                url = url.split('/url?q=')[1].split('&')[0]
+                                        url = _unwrap_google_redirect(url)
                                         
-                                        snippet_elem = div.select_one('.VwiC3b') or div.select_one('.s') or div.select_one('.st')
+                                        snippet_elem = None
+                                        for snippet_sel in _SNIPPET_SELECTORS:
+                                            snippet_elem = snippet_sel.select_one(div)
+                                            if snippet_elem:
+                                                break
                                         snippet = snippet_elem.get_text().strip() if snippet_elem else ''
                                         
                                         logger.info(f"✅ Found {platform} result: '{title}' -> '{url}'")
@@ -345,16 +357,12 @@ class URLFilter:
             return None
         
         # Remove Google redirect
-        if url.startswith('/url?q='):
-            url = url.split('/url?q=')[1].split('&')[0]
-        
-        # Validate YouTube URLs
-        if "youtube.com" in url:
-            # Accept various YouTube URL formats
-            valid_patterns = ['/channel/', '/c/', '/@', '/user/']
-            if any(pattern in url for pattern in valid_patterns):
-                return url
-        
+        url = _unwrap_google_redirect(url)
+
+        # Validate YouTube channel URL formats
+        if _YT_URL_RE.search(url):
+            return url
+
         return None
     
     @staticmethod
@@ -364,14 +372,12 @@ class URLFilter:
             return None
         
         # Remove Google redirect
-        if url.startswith('/url?q='):
-            url = url.split('/url?q=')[1].split('&')[0]
-        
-        # Validate Twitch URLs
-        if "twitch.tv" in url and len(url.split('/')) >= 4:
-            # Basic Twitch channel URL validation
+        url = _unwrap_google_redirect(url)
+
+        # Basic Twitch channel URL validation
+        if _TW_URL_RE.search(url):
             return url
-        
+
         return None
 
 
@@ -407,42 +413,50 @@ class YouTubeTwitchScraper:
         """Extract potential name from profile URL"""
         try:
             # Common patterns in X/Twitter URLs
-            if 'x.com' in url or 'twitter.com' in url:
-                # Split by / and find the username part
-                parts = url.split('/')
-                for i, part in enumerate(parts):
-                    if part in ['x.com', 'twitter.com'] and i + 1 < len(parts):
-                        username_part = parts[i + 1]
-                        # Remove query parameters
-                        if '?' in username_part:
-                            username_part = username_part.split('?')[0]
-                        # Remove @ symbol
-                        username_part = username_part.replace('@', '')
-                        # Skip common paths that aren't usernames
-                        if username_part not in ['home', 'explore', 'notifications', 'messages', 'bookmarks', 'lists', 'profile', 'more', 'compose', 'search', 'settings', 'help']:
-                            return username_part.strip()
-            else:
-                # For other URLs, use the last path segment
-                path = url.split('/')[-1] if '/' in url else url
-                
-                # Remove query parameters
-                if '?' in path:
-                    path = path.split('?')[0]
-                
-                # Remove common suffixes
-                path = path.replace('@', '')
-                
-                # Clean up the extracted name
-                cleaned_name = path.strip()
-                
-                if cleaned_name and len(cleaned_name) > 0:
-                    return cleaned_name
-            
+            match = _X_USERNAME_RE.search(url)
+            if match:
+                username_part = match.group(1)
+                # Skip common paths that aren't usernames
+                if username_part in _X_STOP_WORDS:
+                    return ""
+                return username_part
+
+            # For other URLs, use the last path segment without query
+            # parameters or @ prefix
+            return url.rsplit('/', 1)[-1].split('?', 1)[0].replace('@', '').strip()
+
         except Exception as e:
             logger.debug(f"Error extracting name from URL {url}: {e}")
-        
+
         return ""
     
+    @staticmethod
+    def _cheap_url_match(url: str, username: str, profile_name: str) -> bool:
+        """Fast pre-filter run before the full enhanced matcher
+
+        enhanced_name_match fetches the page title over HTTP, so candidates
+        whose path shares nothing with the user are rejected here first.
+        Only human-readable handle/path URLs are filtered: opaque
+        /channel/UC... IDs never resemble the name and can only match via
+        the page title, so they go straight to the full matcher.
+        """
+        raw_path = urlsplit(url).path.lower()
+        if raw_path.startswith('/channel/'):
+            return True
+
+        path = raw_path.replace('-', '').replace('_', '').replace('.', '')
+        for name in (username, profile_name):
+            if not name:
+                continue
+            name_clean = re.sub(r'[^\w]', '', name.lower())
+            if not name_clean:
+                continue
+            if name_clean in path:
+                return True
+            if SequenceMatcher(None, name_clean, path).quick_ratio() >= 0.5:
+                return True
+        return False
+
     async def find_channels_for_user(self, username: str, profile_name: str, url: str = ""):
         """Find YouTube and Twitch channels for a user"""
         results = {
@@ -502,7 +516,11 @@ class YouTubeTwitchScraper:
                             
                             if not clean_url:
                                 continue
-                            
+
+                            # Run the fast filter before the expensive matcher
+                            if not self._cheap_url_match(clean_url, username, profile_name):
+                                continue
+
                             # Enhanced matching
                             if self.channel_matcher.enhanced_name_match(clean_url, username, profile_name):
                                 # Use enhanced matching score
@@ -661,15 +679,16 @@ class YouTubeTwitchScraper:
             logger.info(f"Using {self.max_workers} parallel workers")
             
             # Filter out already processed users
+            # itertuples avoids boxing every cell into a Series per row
             unprocessed_data = []
-            for index, row in df.iterrows():
-                username = row['username']
+            for index, row in enumerate(df.itertuples(index=False)):
+                username = row.username
                 if username not in self.processed_users:
                     user_data = {
                         'username': username,
-                        'profile_name': row['profile_name'],
-                        'url': row['url'],
-                        'followers': row['followers']
+                        'profile_name': row.profile_name,
+                        'url': row.url,
+                        'followers': row.followers
                     }
                     unprocessed_data.append((index, user_data))
             